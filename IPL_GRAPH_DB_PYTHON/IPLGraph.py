@@ -1,8 +1,25 @@
-from typing import Dict
-from neo4j import Transaction
+from typing import Dict, List
+from neo4j import Transaction, AsyncManagedTransaction, AsyncSession
 from model import MatchData, BallData
 
+# Lookups behind the MERGEs of the live delivery writes. Plain indexes rather
+# than uniqueness constraints, which would fail on graphs the batch loader
+# already filled with duplicate players.
+SCHEMA_STATEMENTS = [
+    "CREATE INDEX match_id IF NOT EXISTS FOR (m:Match) ON (m.id)",
+    "CREATE INDEX innings_key IF NOT EXISTS FOR (i:Innings) ON (i.match_id, i.number)",
+    "CREATE INDEX delivery_key IF NOT EXISTS FOR (d:Delivery) ON (d.match_id, d.innings, d.over, d.ball)",
+    "CREATE INDEX player_name IF NOT EXISTS FOR (p:Player) ON (p.name)",
+]
+
 class IPLGraph:
+
+    @staticmethod
+    async def _create_indexes(session: AsyncSession):
+        """Creates the indexes used by the delivery writes if they are missing."""
+        for statement in SCHEMA_STATEMENTS:
+            result = await session.run(statement)
+            await result.consume()
     
     @staticmethod
     def _create_match_nodes(tx: Transaction, match: MatchData):
@@ -152,3 +169,69 @@ class IPLGraph:
             player.wickets = COALESCE(player.wickets, 0) + CASE WHEN $is_wicket_delivery = 1 THEN 1 ELSE 0 END,
             player.economy_rate = (1.0 * COALESCE(player.runs_conceded, 0) / player.balls_bowled) * 6
         """, **delivery.model_dump())
+
+    @staticmethod
+    async def _create_delivery_batch(tx: AsyncManagedTransaction, deliveries: List[BallData]):
+        """Writes a micro-batch of live deliveries, their wickets and player stats in one round trip.
+
+        Safe to re-run: player stats only move for deliveries that did not exist
+        yet. Matches still in progress get a stub Match node that the batch
+        loader fills in later. Returns (deliveries written, deliveries created).
+        """
+        result = await tx.run("""
+        UNWIND $deliveries AS d
+        MERGE (match:Match {id: d.match_id})
+        MERGE (innings:Innings {match_id: d.match_id, number: d.innings})
+        MERGE (match)-[:HAS_INNING]->(innings)
+
+        OPTIONAL MATCH (existing:Delivery {
+            match_id: d.match_id,
+            innings: d.innings,
+            over: d.over,
+            ball: d.ball
+        })
+        WITH d, innings, existing IS NULL AS is_new
+        MERGE (delivery:Delivery {
+            match_id: d.match_id,
+            innings: d.innings,
+            over: d.over,
+            ball: d.ball
+        })
+        SET delivery.batter = d.batter,
+            delivery.bowler = d.bowler,
+            delivery.non_striker = d.non_striker,
+            delivery.extra_type = d.extra_type,
+            delivery.batsman_run = d.batsman_run,
+            delivery.extras_run = d.extras_run,
+            delivery.total_run = d.total_run,
+            delivery.non_boundary = d.non_boundary,
+            delivery.batting_team = d.batting_team
+
+        MERGE (innings)-[:HAS_DELIVERY]->(delivery)
+        MERGE (batter:Player {name: d.batter})
+        MERGE (bowler:Player {name: d.bowler})
+        MERGE (non_striker:Player {name: d.non_striker})
+        MERGE (batter)-[:BATTED_IN]->(delivery)
+        MERGE (bowler)-[:BOWLED_IN]->(delivery)
+        MERGE (non_striker)-[:WAS_NON_STRIKER_IN]->(delivery)
+
+        FOREACH (_ IN CASE WHEN d.is_wicket_delivery = 1 THEN [1] ELSE [] END |
+            MERGE (wicket:Wicket {player_out: d.player_out, type: d.kind})
+            SET wicket.fielders_involved = d.fielders_involved
+            MERGE (delivery)-[:RESULTED_IN]->(wicket)
+            MERGE (dismissed:Player {name: d.player_out})
+            MERGE (wicket)-[:DISMISSED]->(dismissed)
+        )
+
+        FOREACH (_ IN CASE WHEN is_new THEN [1] ELSE [] END |
+            SET batter.runs_scored = COALESCE(batter.runs_scored, 0) + d.batsman_run,
+                batter.balls_faced = COALESCE(batter.balls_faced, 0) + 1
+            SET batter.strike_rate = (1.0 * batter.runs_scored / batter.balls_faced) * 100
+            SET bowler.balls_bowled = COALESCE(bowler.balls_bowled, 0) + 1,
+                bowler.wickets = COALESCE(bowler.wickets, 0) + CASE WHEN d.is_wicket_delivery = 1 THEN 1 ELSE 0 END
+            SET bowler.economy_rate = (1.0 * COALESCE(bowler.runs_conceded, 0) / bowler.balls_bowled) * 6
+        )
+        RETURN count(delivery) AS written, sum(CASE WHEN is_new THEN 1 ELSE 0 END) AS created
+        """, deliveries=[delivery.model_dump() for delivery in deliveries])
+        record = await result.single()
+        return record["written"], record["created"]
@@ -0,0 +1,390 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+from collections import deque
+from typing import List, Optional, Tuple
+import pandas as pd
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import ClientError
+from pydantic import ValidationError
+from IPLGraph import IPLGraph
+from model import BallData
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Columns of ball_by_ball.csv (IPL_ML/dataloader.py) mapped to BallData fields
+BALL_COLUMNS = {
+    "ID": "match_id",
+    "Innings": "innings",
+    "Overs": "over",
+    "BallNumber": "ball",
+    "Batter": "batter",
+    "Bowler": "bowler",
+    "NonStriker": "non_striker",
+    "ExtraType": "extra_type",
+    "BatsmanRun": "batsman_run",
+    "ExtrasRun": "extras_run",
+    "TotalRun": "total_run",
+    "NonBoundary": "non_boundary",
+    "IsWicketDelivery": "is_wicket_delivery",
+    "PlayerOut": "player_out",
+    "Kind": "kind",
+    "FieldersInvolved": "fielders_involved",
+    "BattingTeam": "batting_team",
+}
+
+BALL_INTERVAL_SEC = 30  # Rough real-world gap between two deliveries
+LATENCY_WINDOW = 10000  # Number of recent deliveries kept for latency stats
+DEAD_LETTER_FILE = "dead_letter.jsonl"  # Deliveries Neo4j kept rejecting, replayable with --jsonl --once
+
+
+class LiveIngestor:
+    """Streams live deliveries into Neo4j through a bounded queue.
+
+    Sources validate events and put them on the queue; a single writer drains
+    it in micro-batches of up to `batch_size` deliveries (or whatever arrived
+    within `max_batch_wait` seconds) and commits each batch in one transaction.
+    When the writer falls behind, the queue fills up and sources block on
+    `put`, which stops them reading from their file or socket.
+
+    A batch that still fails after `max_retries` attempts is appended to
+    `dead_letter_file` instead of being dropped. A batch the database rejects
+    outright (ClientError) is split in halves until only the offending
+    deliveries are left to dead-letter.
+    """
+
+    def __init__(self, uri, user, password, batch_size=200, max_batch_wait=0.5, queue_size=5000,
+                 max_retries=3, dead_letter_file=DEAD_LETTER_FILE):
+        self.driver = AsyncGraphDatabase.driver(uri, auth=(user, password))
+        logging.info("Connected to Neo4j Database (async).")
+        self.ipl_graph = IPLGraph()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.max_batch_wait = max_batch_wait
+        self.max_retries = max_retries
+        self.dead_letter_file = dead_letter_file
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.committed = 0
+        self.rejected = 0
+        self.failed = 0
+
+    async def close(self):
+        await self.driver.close()
+        logging.info("Closed connection to Neo4j Database.")
+
+    async def submit(self, payload: dict, checkpoint: Optional[Tuple[str, int]] = None):
+        """Validate one BallData-shaped event and queue it, waiting while the queue is full.
+
+        An optional `emitted_at` field (unix seconds) marks when the event was
+        produced; otherwise the time it reached the ingestor is used. A
+        `checkpoint` of (offset file, offset) is saved once the event is written.
+        """
+        if not isinstance(payload, dict):
+            self.rejected += 1
+            logging.error(f"Rejected event that is not a JSON object: {str(payload)[:100]}")
+            return
+
+        emitted_at = payload.pop("emitted_at", None)
+        if emitted_at is None:
+            emitted_at = time.time()
+        elif isinstance(emitted_at, bool) or not isinstance(emitted_at, (int, float)):
+            self.rejected += 1
+            logging.error(f"Rejected delivery with non-numeric emitted_at {emitted_at!r}")
+            return
+
+        try:
+            ball = BallData.model_validate(payload)
+        except ValidationError as e:
+            self.rejected += 1
+            logging.error(f"Rejected delivery {payload.get('match_id')}.{payload.get('over')}.{payload.get('ball')}: {e}")
+            return
+        if ball.is_wicket_delivery == 1 and not (ball.player_out and ball.kind):
+            # The Wicket node is keyed on both, Neo4j refuses to MERGE on null
+            self.rejected += 1
+            logging.error(f"Rejected wicket delivery {ball.match_id}.{ball.over}.{ball.ball} without player_out/kind")
+            return
+        await self.queue.put((ball, float(emitted_at), checkpoint))
+
+    async def consume_jsonl(self, path, follow=True, poll_interval=0.2, offset_file=None):
+        """Tail a JSONL file, one delivery per line, like `tail -f`.
+
+        The byte offset of the last written line is kept in `offset_file`
+        (default `<path>.offset`), so a restart resumes where it stopped
+        instead of re-sending the whole file.
+        """
+        offset_file = offset_file or f"{path}.offset"
+        offset = 0
+        if os.path.exists(offset_file):
+            with open(offset_file, "r") as file:
+                offset = int(file.read().strip() or 0)
+            if offset > os.path.getsize(path):
+                logging.info(f"{path} is shorter than the saved offset, starting from the top.")
+                offset = 0
+
+        logging.info(f"Tailing deliveries from {path} at byte {offset}...")
+        with open(path, "rb") as file:
+            file.seek(offset)
+            pending = b""
+            while True:
+                line = file.readline()
+                if not line:
+                    if not follow:
+                        break
+                    await asyncio.sleep(poll_interval)
+                    continue
+
+                pending += line
+                if not pending.endswith(b"\n"):
+                    continue  # Writer is mid-line, wait for the rest
+                line, pending = pending.strip(), b""
+                if line:
+                    await self._submit_line(line, (offset_file, file.tell()))
+
+    async def consume_socket(self, host="127.0.0.1", port=9999):
+        """Accept newline-delimited JSON deliveries over TCP until cancelled."""
+        async def handle_client(reader, writer):
+            peer = writer.get_extra_info("peername")
+            logging.info(f"Live feed connected from {peer}.")
+            try:
+                while line := await reader.readline():
+                    if line.strip():
+                        await self._submit_line(line)
+            finally:
+                writer.close()
+                logging.info(f"Live feed from {peer} disconnected.")
+
+        server = await asyncio.start_server(handle_client, host, port)
+        logging.info(f"Listening for deliveries on {host}:{port}...")
+        async with server:
+            await server.serve_forever()
+
+    async def replay_csv(self, path, speedup=100.0, match_ids: Optional[List[int]] = None):
+        """Replay ball_by_ball.csv as a live feed, `speedup` times faster than a real match."""
+        df = pd.read_csv(path)
+        if match_ids:
+            df = df[df["ID"].isin(match_ids)]
+        df = df.sort_values(by=["ID", "Innings", "Overs", "BallNumber"]).rename(columns=BALL_COLUMNS)
+        df = df[list(BALL_COLUMNS.values())].astype(object)
+        events = df.where(df.notna(), None).to_dict("records")
+
+        interval = BALL_INTERVAL_SEC / speedup
+        logging.info(f"Replaying {len(events)} deliveries from {path} at {speedup:g}x ({1 / interval:.1f} balls/sec)...")
+        start_time = time.monotonic()
+        for i, event in enumerate(events):
+            # Pace against the schedule rather than sleeping a fixed gap, so
+            # time spent blocked on a full queue is not added on top
+            delay = start_time + i * interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            event["emitted_at"] = time.time()
+            await self.submit(event)
+
+    async def _submit_line(self, line, checkpoint=None):
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as e:
+            self.rejected += 1
+            logging.error(f"Rejected malformed event {line[:100]!r}: {e}")
+            return
+        await self.submit(payload, checkpoint)
+
+    async def _next_batch(self) -> Tuple[List[Tuple[BallData, float, Optional[Tuple[str, int]]]], bool]:
+        """Wait for the next micro-batch; the flag is set once the stop marker is reached."""
+        loop = asyncio.get_running_loop()
+        item = await self.queue.get()
+        deadline = loop.time() + self.max_batch_wait
+        batch = []
+        while item is not None:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, False
+            try:
+                item = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    return batch, False
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    return batch, False
+        return batch, True
+
+    async def _write_balls(self, session, balls):
+        """Write deliveries, retrying with backoff; returns (written, deliveries to dead-letter).
+
+        A write that reports fewer deliveries than it was given dead-letters
+        all of them, which is safe because replaying a delivery is idempotent.
+        """
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                written, _ = await session.execute_write(self.ipl_graph._create_delivery_batch, balls)
+                if written < len(balls):
+                    logging.error(f"Only {written} of {len(balls)} deliveries in the batch were written.")
+                    return written, balls
+                return written, []
+            except ClientError as e:
+                # Rejected by the database itself, so retrying the same rows cannot help
+                if len(balls) == 1:
+                    logging.error(f"Delivery {balls[0].match_id}.{balls[0].over}.{balls[0].ball} rejected: {str(e)}")
+                    return 0, balls
+                middle = len(balls) // 2
+                written_left, failed_left = await self._write_balls(session, balls[:middle])
+                written_right, failed_right = await self._write_balls(session, balls[middle:])
+                return written_left + written_right, failed_left + failed_right
+            except Exception as e:
+                logging.error(
+                    f"Error inserting {len(balls)} deliveries starting at "
+                    f"{balls[0].match_id}.{balls[0].over}.{balls[0].ball} "
+                    f"(attempt {attempt}/{self.max_retries}): {str(e)}"
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(2 ** attempt)  # Sources block meanwhile
+        return 0, balls
+
+    async def _write_batch(self, session, batch):
+        """Write one queued batch and dead-letter whatever could not be written."""
+        # The same delivery twice in one batch would read as new both times
+        unique = {}
+        for ball, _, _ in batch:
+            unique.setdefault((ball.match_id, ball.innings, ball.over, ball.ball), ball)
+
+        written, failed = await self._write_balls(session, list(unique.values()))
+        self.committed += written
+        if failed:
+            self._dead_letter(failed)
+            self.failed += len(failed)
+
+        failed_keys = {(ball.match_id, ball.innings, ball.over, ball.ball) for ball in failed}
+        committed_at = time.time()
+        self.latencies.extend(
+            committed_at - emitted_at for ball, emitted_at, _ in batch
+            if (ball.match_id, ball.innings, ball.over, ball.ball) not in failed_keys
+        )
+
+    def _dead_letter(self, balls):
+        """Append deliveries that could not be written to the dead-letter JSONL."""
+        with open(self.dead_letter_file, "a", encoding="utf-8") as file:
+            for ball in balls:
+                file.write(ball.model_dump_json() + "\n")
+        logging.error(f"Wrote {len(balls)} deliveries to {self.dead_letter_file} for replay.")
+
+    @staticmethod
+    def _save_checkpoints(batch):
+        """Persist the furthest source offset covered by a finished batch."""
+        offsets = {}
+        for _, _, checkpoint in batch:
+            if checkpoint:
+                offset_file, offset = checkpoint
+                offsets[offset_file] = offset
+        for offset_file, offset in offsets.items():
+            with open(offset_file, "w") as file:
+                file.write(str(offset))
+
+    async def run_writer(self):
+        """Drain the queue into Neo4j until the stop marker arrives."""
+        batches = 0
+        async with self.driver.session() as session:
+            try:
+                await self.ipl_graph._create_indexes(session)
+            except Exception as e:
+                logging.warning(f"Could not create indexes, writes will slow down as the graph grows: {str(e)}")
+
+            while True:
+                batch, stopping = await self._next_batch()
+                if batch:
+                    try:
+                        await self._write_batch(session, batch)
+                        # Written or dead-lettered, either way the source need not resend it
+                        self._save_checkpoints(batch)
+                    except Exception as e:
+                        # Keep draining the queue; the checkpoint stays put so a restart resends these
+                        self.failed += len(batch)
+                        logging.exception(f"Unexpected error handling a batch of {len(batch)} deliveries: {str(e)}")
+
+                    batches += 1
+                    if batches % 20 == 0:  # Log every 20 batches
+                        self.log_stats()
+                if stopping:
+                    break
+
+    def latency_stats(self):
+        """Event-to-commit latency (seconds) over the most recent deliveries."""
+        if not self.latencies:
+            return {}
+        latencies = sorted(self.latencies)
+        return {
+            "p50": latencies[len(latencies) // 2],
+            "p95": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+            "max": latencies[-1],
+        }
+
+    def log_stats(self):
+        stats = self.latency_stats()
+        latency = " | ".join(f"{name} {value * 1000:.0f} ms" for name, value in stats.items())
+        logging.info(
+            f"Committed {self.committed} deliveries ({self.rejected} rejected, {self.failed} failed), "
+            f"queue {self.queue.qsize()}/{self.queue.maxsize} | event-to-commit latency: {latency or 'n/a'}"
+        )
+
+    async def run(self, *sources):
+        """Run the writer alongside the given sources until they finish or are cancelled."""
+        writer = asyncio.create_task(self.run_writer())
+        try:
+            await asyncio.gather(*sources)
+        finally:
+            await self.queue.put(None)  # Flush what is queued, then stop
+            await writer
+            self.log_stats()
+
+
+async def main(args):
+    ingestor = LiveIngestor(
+        args.uri, args.user, args.password,
+        batch_size=args.batch_size, max_batch_wait=args.max_batch_wait, queue_size=args.queue_size,
+        max_retries=args.max_retries, dead_letter_file=args.dead_letter
+    )
+    try:
+        if args.replay:
+            await ingestor.run(ingestor.replay_csv(args.replay, speedup=args.speedup))
+        elif args.jsonl:
+            await ingestor.run(ingestor.consume_jsonl(args.jsonl, follow=not args.once))
+        else:
+            await ingestor.run(ingestor.consume_socket(args.host, args.port))
+    finally:
+        await ingestor.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream live IPL deliveries into Neo4j.")
+    parser.add_argument("--uri", default="neo4j://localhost:7687")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--jsonl", help="Tail deliveries from this JSONL file")
+    parser.add_argument("--once", action="store_true", help="Stop at the end of the --jsonl file instead of tailing it")
+    parser.add_argument("--replay", help="Replay this ball_by_ball.csv as a live feed")
+    parser.add_argument("--speedup", type=float, default=100.0, help="Replay speed relative to a real match")
+    parser.add_argument("--host", default="127.0.0.1", help="Socket host when no file source is given")
+    parser.add_argument("--port", type=int, default=9999, help="Socket port when no file source is given")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--max-batch-wait", type=float, default=0.5)
+    parser.add_argument("--queue-size", type=int, default=5000)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--dead-letter", default=DEAD_LETTER_FILE, help="Where failed batches are written")
+
+    args = parser.parse_args()
+    if args.jsonl and os.path.abspath(args.jsonl) == os.path.abspath(args.dead_letter):
+        # Failures would be appended to the file being tailed and come straight back
+        parser.error("--jsonl must differ from --dead-letter; replay a dead-letter file with "
+                     "--once and another --dead-letter path")
+
+    logging.info("Starting live ingestion...")
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        logging.info("Live ingestion stopped.")
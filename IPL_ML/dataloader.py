@@ -1,6 +1,7 @@
 import json
 import pandas as pd
 import os
+from rollup import update_rollup
 
 # Define output CSV file names
 MATCHES_CSV = "matches.csv"
@@ -129,3 +130,6 @@ match_df.to_csv(MATCHES_CSV, index=False)
 ball_df.to_csv(BALL_BY_BALL_CSV, index=False)
 
 print(f"✅ Processing complete! Match data saved to {MATCHES_CSV}, Ball-by-ball data saved to {BALL_BY_BALL_CSV}.")
+
+# Fold the newly converted matches into the team/venue/season rollup cube
+update_rollup(match_df, ball_df)
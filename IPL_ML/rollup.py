@@ -0,0 +1,216 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Materialized rollup cube of team/venue/season/phase aggregates.
+#
+# Every row holds one match's contribution to one cube cell together with the
+# running totals of that cell up to and including the match. Cells are keyed by
+# (Team, Venue, Season, Phase) where any of the dimensions may be rolled up to
+# ALL, so "Mumbai Indians at any venue" or "any team at Wankhede" are plain
+# lookups instead of a groupby over the whole dataset. Rows are sorted by cell
+# and Date, which lets an "as of match X" read be a binary search that only
+# sees matches played strictly before X.
+
+ROLLUP_PARQUET = "rollup_cube.parquet"
+
+ALL = "*"
+KEY_COLUMNS = ["Team", "Venue", "Season", "Phase"]
+MEASURE_COLUMNS = ["Innings", "Runs", "Balls", "Wickets", "Matches", "Wins", "TossWins", "TossWinsConverted"]
+CUMULATIVE_COLUMNS = ["Cum" + col for col in MEASURE_COLUMNS]
+
+# Same phase boundaries as the IsPowerplay / IsMiddleOver / IsDeathOver features
+PHASES = ["Powerplay", "Middle", "Death"]
+MATCH_PHASE = "Match"
+
+# Season keys are stored as in matches.csv; the notebook's sequential numbers
+# (season_mapping) are accepted by RollupStore and translated back
+SEASON_MAPPING = {
+    '2007/08': 1, '2009': 2, '2009/10': 3, '2011': 4, '2012': 5, '2013': 6,
+    '2014': 7, '2015': 8, '2016': 9, '2017': 10, '2018': 11, '2019': 12,
+    '2020/21': 13, '2021': 14, '2022': 15, '2023': 16, '2024': 17
+}
+SEASON_NAMES = {number: name for name, number in SEASON_MAPPING.items()}
+
+# Same replacements as the notebook so cube keys line up with merged_data
+TEAM_NAME_MAPPING = {
+    'Delhi Daredevils': 'Delhi Capitals',
+    'Deccan Chargers': 'Sunrisers Hyderabad',
+    'Rising Pune Supergiant': 'Rising Pune Supergiants'
+}
+
+
+def over_phase(overs):
+    """Map 0-based over numbers to Powerplay / Middle / Death."""
+    return np.select([overs < 6, overs < 15], PHASES[:2], PHASES[2])
+
+
+def match_facts(matches, ball_by_ball):
+    """Per match, team and phase facts at the finest grain of the cube.
+
+    Phase rows carry the batting measures of that phase. The extra "Match"
+    phase row sums them for the whole innings and also carries the match-level
+    outcomes (matches played, wins and toss results), which are left at zero on
+    the phase rows so that no outcome is ever counted twice.
+    """
+    matches = matches[["ID", "Date", "Season", "Venue", "Team1", "Team2", "TossWinner", "WinningTeam"]].copy()
+    # dataloader.py takes IDs from file names (str), the notebook reads them back as int
+    matches["ID"] = matches["ID"].astype("int64")
+    for col in ["Team1", "Team2", "TossWinner", "WinningTeam"]:
+        matches[col] = matches[col].replace(TEAM_NAME_MAPPING)
+    matches["Date"] = pd.to_datetime(matches["Date"])
+    matches["Season"] = matches["Season"].astype(str)
+
+    balls = ball_by_ball.assign(ID=ball_by_ball["ID"].astype("int64"))
+    balls = balls[balls["ID"].isin(matches["ID"])].copy()
+    balls["BattingTeam"] = balls["BattingTeam"].replace(TEAM_NAME_MAPPING)
+    balls["Phase"] = over_phase(balls["Overs"].to_numpy())
+
+    batting = (
+        balls.groupby(["ID", "BattingTeam", "Phase"], as_index=False)
+        .agg(Innings=("Innings", "nunique"), Runs=("TotalRun", "sum"),
+             Balls=("BallNumber", "count"), Wickets=("IsWicketDelivery", "sum"))
+        .rename(columns={"BattingTeam": "Team"})
+    )
+    innings = (
+        balls.groupby(["ID", "BattingTeam"], as_index=False)
+        .agg(Innings=("Innings", "nunique"), Runs=("TotalRun", "sum"),
+             Balls=("BallNumber", "count"), Wickets=("IsWicketDelivery", "sum"))
+        .rename(columns={"BattingTeam": "Team"})
+    )
+
+    # Both sides get a Match row, even if they never batted (abandoned games)
+    sides = pd.concat([
+        matches.rename(columns={"Team1": "Team"}).drop(columns="Team2"),
+        matches.rename(columns={"Team2": "Team"}).drop(columns="Team1"),
+    ], ignore_index=True)
+    sides["Matches"] = 1
+    sides["Wins"] = (sides["Team"] == sides["WinningTeam"]).astype(int)
+    sides["TossWins"] = (sides["Team"] == sides["TossWinner"]).astype(int)
+    sides["TossWinsConverted"] = sides["TossWins"] & sides["Wins"]
+    match_rows = sides.merge(innings, on=["ID", "Team"], how="left")
+    match_rows["Phase"] = MATCH_PHASE
+
+    phase_rows = batting.merge(sides.drop(columns=["Matches", "Wins", "TossWins", "TossWinsConverted"]),
+                               on=["ID", "Team"], how="inner")
+
+    facts = pd.concat([match_rows, phase_rows], ignore_index=True)
+    facts[MEASURE_COLUMNS] = facts[MEASURE_COLUMNS].fillna(0).astype("int64")
+    return facts[["ID", "Date"] + KEY_COLUMNS + MEASURE_COLUMNS]
+
+
+def roll_up(facts):
+    """Aggregate facts into every grouping set of Team x Venue x Season (Phase is always kept)."""
+    rolled_dims = ["Team", "Venue", "Season"]
+    cells = []
+    for mask in range(1 << len(rolled_dims)):
+        level = facts.copy()
+        for i, dim in enumerate(rolled_dims):
+            if mask & (1 << i):
+                level[dim] = ALL
+        cells.append(level.groupby(["ID", "Date"] + KEY_COLUMNS, as_index=False)[MEASURE_COLUMNS].sum())
+    return pd.concat(cells, ignore_index=True)
+
+
+def accumulate(cube):
+    """Sort by cell and date and (re)compute the running totals per cell."""
+    cube = cube.sort_values(KEY_COLUMNS + ["Date", "ID"]).reset_index(drop=True)
+    cube[CUMULATIVE_COLUMNS] = cube.groupby(KEY_COLUMNS)[MEASURE_COLUMNS].cumsum().to_numpy()
+    return cube
+
+
+def build_rollup(matches, ball_by_ball):
+    """Build the full rollup cube from the converted matches / ball_by_ball tables."""
+    return accumulate(roll_up(match_facts(matches, ball_by_ball)))
+
+
+def update_rollup(matches, ball_by_ball, path=ROLLUP_PARQUET):
+    """Fold newly converted matches into the cube stored at `path` and save it.
+
+    Matches already present in the cube are skipped. Only cells touched by the
+    new matches have their running totals recomputed, so late-arriving matches
+    dated before existing ones still end up in the right order.
+    """
+    if not os.path.exists(path):
+        cube = build_rollup(matches, ball_by_ball)
+        cube.to_parquet(path, index=False)
+        print(f"Rollup cube built with {len(cube)} rows and saved to {path}.")
+        return cube
+
+    cube = pd.read_parquet(path)
+    cube["ID"] = cube["ID"].astype("int64")
+    new_matches = matches[~matches["ID"].astype("int64").isin(cube["ID"].unique())]
+    if new_matches.empty:
+        print(f"Rollup cube at {path} is already up to date.")
+        return cube
+
+    new_cells = roll_up(match_facts(new_matches, ball_by_ball))
+    touched = pd.MultiIndex.from_frame(cube[KEY_COLUMNS]).isin(
+        pd.MultiIndex.from_frame(new_cells[KEY_COLUMNS].drop_duplicates())
+    )
+    refreshed = accumulate(pd.concat([cube.loc[touched, new_cells.columns], new_cells], ignore_index=True))
+    cube = pd.concat([cube.loc[~touched], refreshed], ignore_index=True)
+    cube = cube.sort_values(KEY_COLUMNS + ["Date", "ID"]).reset_index(drop=True)
+    cube.to_parquet(path, index=False)
+    print(f"Rollup cube updated with {len(new_matches)} new matches and saved to {path}.")
+    return cube
+
+
+class RollupStore:
+    """Indexed, read-only view over a saved rollup cube."""
+
+    def __init__(self, path=ROLLUP_PARQUET):
+        self.cube = pd.read_parquet(path)
+        self.cube["ID"] = self.cube["ID"].astype("int64")
+        self.cube = self.cube.sort_values(KEY_COLUMNS + ["Date", "ID"]).reset_index(drop=True)
+        self.dates = self.cube["Date"].to_numpy(dtype="datetime64[ns]")
+        self.totals = self.cube[CUMULATIVE_COLUMNS].to_numpy()
+        self.match_dates = self.cube.drop_duplicates("ID").set_index("ID")["Date"]
+
+        # Each cell is a contiguous slice of the sorted cube
+        keys = self.cube[KEY_COLUMNS].itertuples(index=False, name=None)
+        self.cells = {}
+        for i, key in enumerate(keys):
+            start, _ = self.cells.get(key, (i, i))
+            self.cells[key] = (start, i + 1)
+
+    def as_of(self, date, team=ALL, venue=ALL, season=ALL, phase=MATCH_PHASE):
+        """Running totals of a cell from matches played strictly before `date`.
+
+        `season` is either the matches.csv value ("2007/08", "2024") or the
+        notebook's sequential number (1..17). Raises KeyError for a cell that
+        never appears in the cube, e.g. a misspelt team or venue.
+        """
+        totals = dict.fromkeys(CUMULATIVE_COLUMNS, 0)
+        if season != ALL and not isinstance(season, str):
+            season = SEASON_NAMES.get(season, season)
+        key = (team, venue, str(season), phase)
+        cell = self.cells.get(key)
+        if cell is None:
+            raise KeyError(f"No rollup cell for (Team, Venue, Season, Phase) = {key}")
+
+        start, end = cell
+        date = np.datetime64(pd.Timestamp(date), "ns")
+        i = start + np.searchsorted(self.dates[start:end], date, side="left") - 1
+        if i >= start:
+            totals.update(zip(CUMULATIVE_COLUMNS, self.totals[i].tolist()))
+        return totals
+
+    def as_of_match(self, match_id, team=ALL, venue=ALL, season=ALL, phase=MATCH_PHASE):
+        """Running totals of a cell as known before match `match_id` was played."""
+        return self.as_of(self.match_dates[int(match_id)], team, venue, season, phase)
+
+    def venue_avg_runs(self, date, venue):
+        """Leak-free counterpart of the notebook's VenueAvgRuns."""
+        totals = self.as_of(date, venue=venue)
+        return totals["CumRuns"] / totals["CumInnings"] if totals["CumInnings"] else 0.0
+
+    def win_percentage(self, date, team):
+        """Leak-free counterpart of the notebook's calculate_win_percentage."""
+        totals = self.as_of(date, team=team)
+        return totals["CumWins"] * 100 / totals["CumMatches"] if totals["CumMatches"] else 0.0
+
+    def toss_impact(self, date, team=ALL):
+        """Share of toss wins converted into match wins before `date`."""
+        totals = self.as_of(date, team=team)
+        return totals["CumTossWinsConverted"] / totals["CumTossWins"] if totals["CumTossWins"] else 0.0
@@ -0,0 +1,211 @@
+import sys
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.metrics import mean_absolute_error
+
+# CPU baseline for the TotalRun regression in ipl.ipynb. Instead of turning the
+# engineered features into text for LongformerXLNet, the numeric columns and
+# frequency-encoded categoricals are packed into one float32 matrix and fed to
+# a histogram gradient boosting model, which trains on all cores via OpenMP.
+
+FEATURES_FILE = "merged_data.parquet"
+MODEL_FILE = "hgb_baseline.joblib"
+TRANSFORMER_PREDICTIONS = "IPL_predictions.csv"
+
+TARGET = "TotalRun"
+TEST_SEASON = 17  # 2024 after the notebook's season_mapping
+
+# Same categorical columns as the notebook's transformer split
+CATEGORICAL_FEATURES = [
+    "Batter", "Bowler", "NonStriker", "BattingTeam", "Team1", "Team2", "Venue",
+    "TossWinner", "WinningTeam", "Player_of_Match", "TossDecision", "SuperOver", "WonBy"
+]
+EXCLUDED_COLUMNS = [TARGET, "ID", "Season"]
+
+# Notebook features that include the ball being predicted. They are replaced
+# by their value on the previous ball of the same group, i.e. the state of the
+# game just before this delivery.
+RUNNING_FEATURES = {
+    ("ID", "Innings"): ["CumulativeRuns", "CurrentRunRate", "WicketsFallen", "WicketsLeft",
+                        "Last5BallsRuns", "Last5BallsWickets"],
+    ("ID", "Batter"): ["BatsmanCumulativeRuns", "BatsmanBallsFaced", "BatsmanStrikeRate",
+                       "BatsmanCumulativeBoundaries"],
+    ("ID", "Innings", "Partnership"): ["CurrentPartnershipRuns"],
+}
+PRE_BALL_DEFAULTS = {"WicketsLeft": 10}
+
+# The notebook derives these from the larger TeamTotalRuns of the match, which
+# can be the chasing side's own final total; they are rebuilt from the first
+# innings total instead (see chase_features)
+CHASE_FEATURES = ["RequiredRunRate", "PressureIndex"]
+
+# Features that cannot be shifted to a pre-ball state: parts of this ball's
+# outcome, totals over the whole over/innings/match (or all seasons), and
+# results only known once the match is over
+LEAKING_FEATURES = [
+    "BatsmanRun", "ExtrasRun", "NonBoundary", "IsWicketDelivery",
+    "TeamTotalRuns", "LastOverRuns", "VenueAvgRuns", "Team1WinPercentage", "Team2WinPercentage",
+    "BowlerEconomyRate", "BowlerWickets", "BowlerTotalBalls", "BowlerDotBalls", "BowlerDotBallPercentage",
+    "BatsmanVsBowlerStrikeRate", "BatsmanVsBowlerDismissalRate",
+    "WinningTeam", "Player_of_Match", "WonBy", "Margin", "TossImpact"
+]
+
+# Histogram models bin categories, so rarer values share the missing bucket
+MAX_CATEGORIES = 254
+
+
+def pre_ball_features(df):
+    """Shift running aggregates back one ball and drop features that leak the target.
+
+    Rows must cover whole innings, since each value comes from the previous
+    delivery of its group.
+    """
+    df = df.sort_values(by=["ID", "Innings", "Overs", "BallNumber"], kind="stable")
+    df = df.drop(columns=[col for col in LEAKING_FEATURES if col in df.columns])
+    for group, columns in RUNNING_FEATURES.items():
+        columns = [col for col in columns if col in df.columns]
+        if not columns or not set(group).issubset(df.columns):
+            continue
+        shifted = df.groupby(list(group), sort=False)[columns].shift(1)
+        df[columns] = shifted.fillna({col: PRE_BALL_DEFAULTS.get(col, 0) for col in columns})
+    return chase_features(df)
+
+
+def chase_features(df):
+    """Rebuild RequiredRunRate / PressureIndex before each ball of the second innings.
+
+    The target is the first innings total + 1, which is known for the whole
+    chase. Expects CumulativeRuns and CurrentRunRate already in pre-ball form.
+    """
+    columns = [col for col in CHASE_FEATURES if col in df.columns]
+    if not columns:
+        return df
+    if not {TARGET, "CumulativeRuns", "CurrentRunRate"}.issubset(df.columns):
+        return df.drop(columns=columns)
+
+    first_innings = df["Innings"] == 1
+    target_runs = df["ID"].map(df.loc[first_innings].groupby("ID")[TARGET].sum()) + 1
+    overs_remaining = 20 - (df["Overs"] + (df["BallNumber"] - 1) / 6)
+    required = ((target_runs - df["CumulativeRuns"]) / overs_remaining).where(df["Innings"] == 2, 0)
+    required = required.replace([np.inf, -np.inf], np.nan).fillna(0)
+
+    if "RequiredRunRate" in columns:
+        df["RequiredRunRate"] = required
+    if "PressureIndex" in columns:
+        pressure = required / df["CurrentRunRate"]
+        df["PressureIndex"] = pressure.replace([np.inf, -np.inf], np.nan).fillna(0)
+    return df
+
+
+def fit_encoding(train_df):
+    """Pick the feature columns and the category vocabulary from the training rows."""
+    numeric = [
+        col for col in train_df.columns
+        if col not in EXCLUDED_COLUMNS and col not in CATEGORICAL_FEATURES
+        and pd.api.types.is_numeric_dtype(train_df[col]) and train_df[col].notna().any()
+    ]
+    categories = {
+        col: train_df[col].value_counts().index[:MAX_CATEGORIES].tolist()
+        for col in CATEGORICAL_FEATURES if col in train_df.columns
+    }
+    return {"numeric": numeric, "categories": categories}
+
+
+def to_matrix(df, encoding):
+    """Pack rows into a compact float32 matrix; unseen categories become NaN."""
+    numeric = encoding["numeric"]
+    categories = encoding["categories"]
+    X = np.empty((len(df), len(numeric) + len(categories)), dtype=np.float32)
+    X[:, :len(numeric)] = df[numeric].to_numpy(dtype=np.float32, na_value=np.nan)
+    for i, (col, values) in enumerate(categories.items(), len(numeric)):
+        codes = pd.Index(values).get_indexer(df[col])
+        X[:, i] = np.where(codes < 0, np.nan, codes)
+    return X
+
+
+def train_baseline(merged_data, model_file=MODEL_FILE):
+    """Train on Season < 17, evaluate on Season == 17 and save the model bundle."""
+    merged_data = pre_ball_features(merged_data)
+    train_df = merged_data[merged_data["Season"] < TEST_SEASON]
+    test_df = merged_data[merged_data["Season"] == TEST_SEASON]
+
+    encoding = fit_encoding(train_df)
+    X_train, y_train = to_matrix(train_df, encoding), train_df[TARGET].to_numpy(dtype=np.float32)
+    X_test, y_test = to_matrix(test_df, encoding), test_df[TARGET].to_numpy(dtype=np.float32)
+    print(f"Train matrix: {X_train.shape}, Test matrix: {X_test.shape} "
+          f"({(X_train.nbytes + X_test.nbytes) / 1e6:.1f} MB)")
+
+    is_categorical = np.zeros(X_train.shape[1], dtype=bool)
+    is_categorical[len(encoding["numeric"]):] = True
+    model = HistGradientBoostingRegressor(
+        max_iter=300,
+        learning_rate=0.1,
+        max_leaf_nodes=63,
+        categorical_features=is_categorical,
+        early_stopping=True,
+        random_state=42
+    )
+
+    start_time = time.perf_counter()
+    model.fit(X_train, y_train)
+    train_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    predictions = model.predict(X_test)
+    inference_time = time.perf_counter() - start_time
+
+    report = {
+        "MAE": mean_absolute_error(y_test, predictions),
+        "TrainTimeSec": train_time,
+        "InferenceTimeSec": inference_time,
+        "RowsPerSec": len(X_test) / inference_time if inference_time > 0 else float("inf"),
+        "Iterations": model.n_iter_
+    }
+    print(f"HistGradientBoosting MAE: {report['MAE']:.4f} | trained in {train_time:.2f} sec "
+          f"({model.n_iter_} iterations) | scored {len(X_test)} rows in {inference_time:.3f} sec "
+          f"({report['RowsPerSec']:.0f} rows/sec)")
+
+    joblib.dump({"model": model, "encoding": encoding}, model_file)
+    print(f"Model saved to {model_file}")
+    return report
+
+
+def load_baseline(model_file=MODEL_FILE):
+    """Load a saved model bundle."""
+    return joblib.load(model_file)
+
+
+def predict(bundle, df):
+    """Score engineered feature rows (whole innings) with a saved model bundle.
+
+    Returns a Series aligned with the rows of `df`, whatever their order.
+    """
+    features = pre_ball_features(df)
+    predictions = bundle["model"].predict(to_matrix(features, bundle["encoding"]))
+    return pd.Series(predictions, index=features.index, name="PredictedRuns").reindex(df.index)
+
+
+def compare_with_transformer(report, predictions_file=TRANSFORMER_PREDICTIONS,
+                             transformer_train_time=None, transformer_inference_time=None):
+    """Print the baseline next to LongformerXLNet, using the predictions the notebook saves."""
+    results = pd.read_csv(predictions_file)
+    comparison = pd.DataFrame({
+        "MAE": [report["MAE"], mean_absolute_error(results["Actual Runs"], results["Predicted Runs"])],
+        "TrainTimeSec": [report["TrainTimeSec"], transformer_train_time],
+        "InferenceTimeSec": [report["InferenceTimeSec"], transformer_inference_time],
+    }, index=["HistGradientBoosting", "LongformerXLNet"])
+    print(comparison)
+    return comparison
+
+
+if __name__ == "__main__":
+    features_file = sys.argv[1] if len(sys.argv) > 1 else FEATURES_FILE
+    merged_data = pd.read_parquet(features_file)
+    baseline_report = train_baseline(merged_data)
+    try:
+        compare_with_transformer(baseline_report)
+    except FileNotFoundError:
+        print(f"No transformer predictions at {TRANSFORMER_PREDICTIONS}, skipping comparison.")